@@ -1,88 +1,124 @@
 import os
+import glob
+import numpy as np
 import pandas as pd
-from sklearn.metrics import accuracy_score, precision_score, recall_score, roc_auc_score, f1_score
+from sklearn.metrics import roc_auc_score
 from joblib import load
 from load_data import load_data
+from label_encoding import binary_label_encode
 import warnings
-from typing import Optional, Dict, Union
+from sklearn import set_config
+from typing import Optional, Dict, Union, Tuple
 
 warnings.filterwarnings("ignore")
 
+set_config(assume_finite=True)
+
+def _binary_confusion(y_true: np.ndarray, y_pred: np.ndarray) -> Tuple[int, int, int, int]:
+    """
+    Computes the binary confusion matrix counts in a single vectorized pass.
+
+    Returns:
+        Tuple[int, int, int, int]: (tp, fp, tn, fn).
+    """
+
+    tn, fp, fn, tp = np.bincount(2 * y_true.astype(np.intp) + y_pred, minlength=4)
+    return int(tp), int(fp), int(tn), int(fn)
+
+def _ratio(numerator: int, denominator: int) -> float:
+    return numerator / denominator if denominator else 0.0
+
 class TPOTModelEvaluator:
     """
     Interface for loading a trained machine learning pipeline and evaluating its performance using standard classification metrics.
 
     Attributes:
         model_dir (str): Path to the directory containing the serialized pipeline (.joblib file).
+        filename (str): Name of the pipeline file written by TPOTModelTrainer.
+        use_float32 (bool): Whether test features are cast to float32, matching the training precision. Disable for pipelines that require float64.
         pipeline (object): Loaded pipeline instance used for predictions.
 
     Methods:
         load_pipeline() -> None:
-            Searches the specified directory and loads the first available .joblib pipeline.
+            Memory-maps the pipeline saved under the expected filename, falling back to the first .joblib file in the directory (the resolved path is cached).
 
         map_labels(y: pd.Series or pd.DataFrame) -> pd.Series:
             Automatically detects and maps two distinct target classes to binary labels (0 and 1).
 
+        predict_scores(X_test: np.ndarray or pd.DataFrame) -> tuple:
+            Returns predicted labels and continuous positive-class scores (predict_proba or decision_function, else None).
+            When predict_proba is available, labels are derived from the probabilities in the same inference pass.
+
         evaluate(X_test: pd.DataFrame, y_test: pd.Series or pd.DataFrame) -> dict:
-            Evaluates the loaded model on the test dataset using metrics such as accuracy, precision, recall, specificity, AUC, and F1-score.
+            Evaluates the loaded model on the test dataset using metrics such as accuracy, precision, recall, specificity, AUC (computed on continuous scores when available), and F1-score.
     """
 
-    def __init__(self, model_dir: str = "models") -> None:
+    def __init__(self, model_dir: str = "models", filename: str = "tpot_best_pipeline.joblib", use_float32: bool = True) -> None:
         self.model_dir: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), model_dir)
+        self.filename: str = filename
+        self.use_float32: bool = use_float32
         self.pipeline: Optional[object] = None
+        self._pipeline_path: Optional[str] = None
 
     def load_pipeline(self) -> None:
-        for file in os.listdir(self.model_dir):
-            if file.endswith(".joblib"):
-                self.pipeline = load(os.path.join(self.model_dir, file))
-                print(f"[Evaluation] Pipeline loaded: {file}")
-                return
-        raise FileNotFoundError("[Evaluation] No .joblib pipeline found in the 'models' directory.")
+        if self._pipeline_path is None:
+            path = os.path.join(self.model_dir, self.filename)
+            if not os.path.isfile(path):
+                path = next(glob.iglob(os.path.join(self.model_dir, "*.joblib")), None)
+            if path is None:
+                raise FileNotFoundError("[Evaluation] No .joblib pipeline found in the 'models' directory.")
+            self._pipeline_path = path
 
-    def map_labels(self, y: Union[pd.Series, pd.DataFrame]) -> pd.Series:
-        if isinstance(y, pd.DataFrame):
-            y = y.iloc[:, 0]
+        self.pipeline = load(self._pipeline_path, mmap_mode="r")
+        print(f"[Evaluation] Pipeline loaded: {os.path.basename(self._pipeline_path)}")
 
-        y = y.astype(str).str.strip()
-        unique = sorted(y.unique())
-
-        if len(unique) != 2:
-            raise ValueError(f"[Evaluation] y contains {len(unique)} classes: {unique}. Binary classification is required.")
-
-        mapping: Dict[str, int] = {unique[0]: 0, unique[1]: 1}
-        y_mapped = y.map(mapping)
-
-        if y_mapped.isnull().any():
-            raise ValueError("[Evaluation] Mapping error: some labels were not converted.")
-
-        return y_mapped.astype(int)
+    def map_labels(self, y: Union[pd.Series, pd.DataFrame]) -> pd.Series:
+        try:
+            return binary_label_encode(y)
+        except ValueError as e:
+            raise ValueError(f"[Evaluation] {e}") from None
+
+    def predict_scores(self, X_test: Union[np.ndarray, pd.DataFrame]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        if hasattr(self.pipeline, "predict_proba"):
+            # Labels are derived from the probabilities, avoiding a second inference pass through predict().
+            proba = self.pipeline.predict_proba(X_test)
+            return self.pipeline.classes_[proba.argmax(axis=1)], proba[:, 1]
+        y_pred = self.pipeline.predict(X_test)
+        if hasattr(self.pipeline, "decision_function"):
+            return y_pred, self.pipeline.decision_function(X_test)
+        return y_pred, None
 
     def evaluate(self, X_test: pd.DataFrame, y_test: Union[pd.Series, pd.DataFrame]) -> Dict[str, float]:
         if self.pipeline is None:
             raise ValueError("[Evaluation] Pipeline not loaded. Use .load_pipeline() before evaluation.")
 
-        y_test_mapped = self.map_labels(y_test)
-        y_pred = self.pipeline.predict(X_test)
+        y_true = self.map_labels(y_test).to_numpy(dtype=np.uint8)
+        X_arr = np.ascontiguousarray(X_test.to_numpy(dtype=np.float32 if self.use_float32 else np.float64))
+        y_pred, y_score = self.predict_scores(X_arr)
+        y_pred = np.asarray(y_pred, dtype=np.uint8)
+
+        tp, fp, tn, fn = _binary_confusion(y_true, y_pred)
+        sensitivity = _ratio(tp, tp + fn)
+        specificity = _ratio(tn, tn + fp)
+        auc = roc_auc_score(y_true, y_score) if y_score is not None else (sensitivity + specificity) / 2
 
         metrics: Dict[str, float] = {
-            "Accuracy (%)": accuracy_score(y_test_mapped, y_pred) * 100,
-            "Precision (%)": precision_score(y_test_mapped, y_pred) * 100,
-            "Sensitivity (%)": recall_score(y_test_mapped, y_pred, pos_label=1) * 100,
-            "Specificity (%)": recall_score(y_test_mapped, y_pred, pos_label=0) * 100,
-            "AUC (%)": roc_auc_score(y_test_mapped, y_pred) * 100,
-            "F1 Score (%)": f1_score(y_test_mapped, y_pred) * 100
+            "Accuracy (%)": _ratio(tp + tn, tp + fp + tn + fn) * 100,
+            "Precision (%)": _ratio(tp, tp + fp) * 100,
+            "Sensitivity (%)": sensitivity * 100,
+            "Specificity (%)": specificity * 100,
+            "AUC (%)": auc * 100,
+            "F1 Score (%)": _ratio(2 * tp, 2 * tp + fp + fn) * 100
         }
 
-        print("[Evaluation] Model Evaluation Metrics:")
-        for name, value in metrics.items():
-            print(f"{name}: {value:.2f}")
+        print("[Evaluation] Model Evaluation Metrics:\n" + "\n".join(f"{name}: {value:.2f}" for name, value in metrics.items()))
 
         return metrics
 
 
 if __name__ == "__main__":
-    X_test = load_data("X_test.xlsx", "processed")
-    y_test = load_data("y_test.xlsx", "processed")
+    X_test = load_data("X_test.feather", "processed")
+    y_test = load_data("y_test.feather", "processed")
 
     evaluator = TPOTModelEvaluator()
     evaluator.load_pipeline()
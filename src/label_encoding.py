@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+from typing import Union
+
+def binary_label_encode(y: Union[pd.Series, pd.DataFrame]) -> pd.Series:
+    """
+    Maps the two distinct classes of a target vector to binary labels (0 and 1), in sorted class order.
+    Integer vectors that already contain exactly the labels 0 and 1 are passed through.
+
+    Parameters:
+        y (pd.Series or pd.DataFrame): Target vector. If a DataFrame is provided, its first column is used.
+
+    Returns:
+        pd.Series: Binary labels encoded as int8.
+    """
+
+    if isinstance(y, pd.DataFrame):
+        y = y.iloc[:, 0]
+
+    # Labels already encoded upstream (e.g. by PreProcessor) are returned without re-parsing.
+    if pd.api.types.is_integer_dtype(y.dtype) and y.isin((0, 1)).all() and y.nunique() == 2:
+        return y.astype(np.int8)
+
+    cat = pd.Categorical(y.astype("string[pyarrow]").str.strip())
+
+    if (cat.codes < 0).any():
+        raise ValueError("y contains missing labels.")
+
+    if len(cat.categories) != 2:
+        raise ValueError(f"y contains {len(cat.categories)} classes: {list(cat.categories)}. Binary classification is required.")
+
+    return pd.Series(cat.codes.astype(np.int8), index=y.index, name=y.name)
\ No newline at end of file
@@ -1,16 +1,63 @@
 import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import feather
+
+def _read_excel_cached(file_path: str) -> pd.DataFrame:
+    """
+    Reads an Excel file through a Parquet cache ('<name>.xlsx.parquet') stored next to it.
+
+    The cache records the source file's size and modification time in its metadata and is only reused on an exact match.
+    A missing, stale or unreadable cache falls back to parsing the Excel file, which then refreshes the cache.
+
+    Parameters:
+        file_path (str): Path to the Excel file.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the Excel data.
+    """
+
+    cache_path = file_path + ".parquet"
+    source = os.stat(file_path)
+    fingerprint = {b"source_size": str(source.st_size).encode(), b"source_mtime_ns": str(source.st_mtime_ns).encode()}
+
+    if os.path.exists(cache_path):
+        try:
+            metadata = pq.read_schema(cache_path).metadata or {}
+            if all(metadata.get(key) == value for key, value in fingerprint.items()):
+                return pq.read_table(cache_path).to_pandas()
+        except Exception as e:
+            print(f"Warning: ignoring unreadable Parquet cache '{cache_path}': {e}")
+
+    df = pd.read_excel(file_path)
+
+    # The cache is optional: failures keep the parsed data, and the atomic replace never leaves a partial cache behind.
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **fingerprint})
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        print(f"Warning: could not cache '{file_path}' as Parquet: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return df
 
 def load_data(dataset_name: str, data_type: str) -> pd.DataFrame:
     """
-    Loads an Excel dataset.
+    Loads a dataset, dispatching on the file extension (Excel, Parquet or Feather). Feather files are memory-mapped,
+    and their null-free numeric columns are returned without copying.
+    Excel files are converted once to a Parquet cache ('<name>.xlsx.parquet') that is reused while the source is unchanged.
 
     Parameters:
-        dataset_name (str): Name of the Excel file (e.g., 'dataset.xlsx').
+        dataset_name (str): Name of the file (e.g., 'dataset.xlsx', 'X_train.feather').
         data_type (str): Data type folder ('raw' or 'processed').
 
     Returns:
-        pd.DataFrame: DataFrame containing the loaded Excel data.
+        pd.DataFrame: DataFrame containing the loaded data.
     """
 
     project_root = os.path.dirname(os.path.dirname(__file__))
@@ -20,8 +67,17 @@ def load_data(dataset_name: str, data_type: str) -> pd.DataFrame:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"The file '{file_path}' does not exist. Path: {file_path}")
 
+    extension = os.path.splitext(dataset_name)[1].lower()
+
     try:
-        df = pd.read_excel(file_path)
+        if extension == ".parquet":
+            df = pd.read_parquet(file_path, engine="pyarrow")
+        elif extension == ".feather":
+            # split_blocks keeps one block per column, so null-free numeric columns stay views on the mapped file instead of
+            # being copied into a consolidated block.
+            df = feather.read_table(file_path, memory_map=True).to_pandas(split_blocks=True)
+        else:
+            df = _read_excel_cached(file_path)
         print(f"Dataset '{dataset_name}' successfully loaded! Shape: {df.shape}")
         return df
     except Exception as e:
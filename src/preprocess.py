@@ -1,6 +1,8 @@
 import os
+import numpy as np
 from sklearn.model_selection import train_test_split
 from load_data import load_data
+from label_encoding import binary_label_encode
 import warnings
 
 warnings.filterwarnings("ignore")
@@ -15,8 +17,8 @@ class PreProcessor:
 
     Methods:
         split() -> None:
-            Splits the dataset into feature matrix (X) and target vector (y), then performs an 80/20 train-test split.
-            Saves the resulting subsets (X_train, X_test, y_train, y_test) as Excel files in 'data/processed'.
+            Splits the dataset into feature matrix (X) and target vector (y), encodes y as int8 binary labels, then performs an 80/20 train-test split.
+            Saves the resulting subsets (X_train, X_test, y_train, y_test) as uncompressed Feather (Arrow IPC) files in 'data/processed'.
 
         execute() -> None:
             Runs the preprocessing pipeline. 
@@ -30,7 +32,14 @@ class PreProcessor:
     def split(self) -> None:
 
         X = self.df.iloc[:, :-1]
-        y = self.df.iloc[:, -1]
+        y = binary_label_encode(self.df.iloc[:, -1])
+
+        # Training and evaluation set sklearn's assume_finite=True and skip its per-call NaN/inf scan, relying on this check.
+        # It runs in float32, the precision the models receive, so values that overflow to inf on the cast are rejected too.
+        with np.errstate(over="ignore"):
+            X_float32 = X.to_numpy(dtype=np.float32)
+        if not np.isfinite(X_float32).all():
+            raise ValueError("[Preprocessing] X contains NaN or infinite values, or values outside the float32 range.")
 
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42, stratify=y
@@ -39,10 +48,10 @@ class PreProcessor:
         processed_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "processed")
         os.makedirs(processed_path, exist_ok=True)
 
-        X_train.to_excel(os.path.join(processed_path, "X_train.xlsx"), index=False)
-        y_train.to_excel(os.path.join(processed_path, "y_train.xlsx"), index=False)
-        X_test.to_excel(os.path.join(processed_path, "X_test.xlsx"), index=False)
-        y_test.to_excel(os.path.join(processed_path, "y_test.xlsx"), index=False)
+        # Uncompressed Arrow IPC (Feather v2) files can be memory-mapped by load_data without decoding.
+        subsets = {"X_train": X_train, "y_train": y_train.to_frame(), "X_test": X_test, "y_test": y_test.to_frame()}
+        for name, subset in subsets.items():
+            subset.reset_index(drop=True).to_feather(os.path.join(processed_path, f"{name}.feather"), compression="uncompressed")
 
         print(f"[Preprocessing] X_train: {X_train.shape}, y_train: {y_train.shape}")
         print(f"[Preprocessing] X_test: {X_test.shape}, y_test: {y_test.shape}")
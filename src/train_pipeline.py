@@ -1,15 +1,86 @@
 import os
+import copy
 import json
+import multiprocessing
+import numpy as np
 import pandas as pd
-from joblib import dump
+from joblib import dump, Memory, parallel_backend
 from load_data import load_data
-from typing import Union, Dict
+from label_encoding import binary_label_encode
+from typing import Union, Dict, Optional
 import warnings
-from sklearn.model_selection import RepeatedStratifiedKFold
+from sklearn import set_config
+from sklearn.model_selection import RepeatedStratifiedKFold, StratifiedShuffleSplit
 from tpot import TPOTClassifier
 
 warnings.filterwarnings("ignore")
 
+set_config(assume_finite=True)
+# The environment variable carries the setting into joblib worker processes, which re-import sklearn.
+os.environ.setdefault("SKLEARN_ASSUME_FINITE", "1")
+
+class SubsampledTPOTClassifier(TPOTClassifier):
+    """
+    TPOTClassifier that scores the first half of the generations on a stratified subsample of the training data.
+
+    Attributes:
+        early_subsample (float): Fraction of training samples used to evaluate individuals in generations below generations // 2.
+            At the first full-data generation every individual scored on the subsample is re-scored on the full training set,
+            so later generations, the Pareto front and the final refit of the best pipeline only see full-data scores.
+            Subsampling is disabled when generations is None, since a search bounded only by max_time_mins has no known midpoint.
+    """
+
+    # Set as a plain attribute rather than an __init__ argument so TPOTClassifier's signature, and with it get_params() and
+    # clone(), stays intact.
+    early_subsample: float = 0.3
+
+    def fit(self, features, target, sample_weight=None, groups=None):
+        # With generations=None the search is bounded only by max_time_mins and TPOT's _fit_init replaces generations with
+        # 1000000, so "the first half" is undefined and every generation would be subsampled. Subsampling is disabled for such
+        # time-bounded searches, including later warm-start fits where generations already holds TPOT's placeholder.
+        if self.generations is None:
+            self._time_bounded = True
+        if self.early_subsample < 1.0 and not getattr(self, "_time_bounded", False):
+            self._subsampled_generations = self.generations // 2
+        else:
+            self._subsampled_generations = 0
+
+        self._evaluated_generations = 0
+        self._subsample_idx: Optional[np.ndarray] = None
+        return super().fit(features, target, sample_weight=sample_weight, groups=groups)
+
+    def _evaluate_individuals(self, population, features, target, sample_weight=None, groups=None):
+        # TPOT evaluates the population exactly once per generation, so the call count is the generation index.
+        generation = self._evaluated_generations
+        self._evaluated_generations += 1
+
+        if generation < self._subsampled_generations:
+            if self._subsample_idx is None:
+                self._full_data_keys = set(self.evaluated_individuals_)
+                splitter = StratifiedShuffleSplit(n_splits=1, train_size=self.early_subsample, random_state=self.random_state)
+                self._subsample_idx, _ = next(splitter.split(features, target))
+            idx = self._subsample_idx
+            features, target = features[idx], target[idx]
+            sample_weight = None if sample_weight is None else np.asarray(sample_weight)[idx]
+            groups = None if groups is None else np.asarray(groups)[idx]
+
+        elif 0 < generation == self._subsampled_generations:
+            # First full-data generation: surviving parents (self._pop, updated in place by TPOT), cloned offspring and the
+            # evaluation cache still hold subsample scores, which would otherwise reach the Pareto front used for the final selection.
+            offspring_ids = {id(ind) for ind in population}
+            parents = [ind for ind in self._pop if id(ind) not in offspring_ids]
+            for ind in population + parents:
+                if ind.fitness.valid:
+                    del ind.fitness.values
+            for key in set(self.evaluated_individuals_) - self._full_data_keys:
+                del self.evaluated_individuals_[key]
+            self._pareto_front.clear()
+
+            super()._evaluate_individuals(population + parents, features, target, sample_weight=sample_weight, groups=groups)
+            return population
+
+        return super()._evaluate_individuals(population, features, target, sample_weight=sample_weight, groups=groups)
+
 class TPOTModelTrainer:
     """
     Interface for training a TPOT pipeline using a custom configuration and saving the best model.
@@ -17,18 +88,20 @@ class TPOTModelTrainer:
     Attributes:
         config_path (str): Path to the external JSON configuration file.
         output_path (str): Path where the trained pipeline will be saved.
-        config (dict): Loaded configuration dictionary.
-        tpot (TPOTClassifier): TPOT instance used for training.
+        checkpoint_dir (str): Directory where TPOT periodically saves the best pipeline found so far.
+        cache_dir (str): Directory used by joblib.Memory to cache fitted transformers shared across pipelines (cleared after each training run).
+        config (dict): Loaded configuration dictionary ('config_dict' search space and 'settings' for the TPOT run).
+        tpot (SubsampledTPOTClassifier): TPOT instance used for training.
 
     Methods:
         load_config() -> dict:
-            Loads the TPOT configuration from a JSON file.
+            Loads and validates the TPOT search space and run settings from a JSON file. Called once at initialization; call again to reload.
 
         map_labels(y: pd.Series or pd.DataFrame) -> pd.Series:
             Automatically maps two distinct target classes to binary labels (0 and 1).
 
         train(X: pd.DataFrame, y: pd.Series or pd.DataFrame) -> None:
-            Loads config, maps labels, and trains TPOT.
+            Maps labels and trains TPOT (repeated calls warm-start from the previous population).
 
         save_pipeline() -> None:
             Serializes and saves the best-performing pipeline to the output path.
@@ -39,51 +112,75 @@ class TPOTModelTrainer:
         project_root = os.path.abspath(os.path.join(current_dir, ".."))
         self.output_path = os.path.abspath(os.path.join(project_root, output_folder, filename))
         self.config_path = os.path.abspath(os.path.join(project_root, "config.json"))
-        self.config: Dict = {}
+        self.checkpoint_dir = os.path.join(project_root, "checkpoints")
+        self.cache_dir = os.path.join(project_root, ".tpot_cache")
+        self.config: Dict = self.load_config()
         self.tpot: Union[TPOTClassifier, None] = None
 
     def load_config(self) -> Dict:
         if not os.path.exists(self.config_path):
             raise FileNotFoundError(f"[Training] Configuration file not found at: {self.config_path}")
         with open(self.config_path, "r") as f:
-            self.config = json.load(f)
+            config = json.load(f)
+
+        if not isinstance(config.get("config_dict"), dict):
+            raise ValueError(f"[Training] Configuration file must define a 'config_dict' object with the TPOT search space: {self.config_path}")
+        if not isinstance(config.get("settings", {}), dict):
+            raise ValueError(f"[Training] The 'settings' entry of the configuration file must be an object: {self.config_path}")
+
+        self.config = config
         return self.config
 
     def map_labels(self, y: Union[pd.Series, pd.DataFrame]) -> pd.Series:
-        if isinstance(y, pd.DataFrame):
-            y = y.iloc[:, 0]
-        
-        y = y.astype(str).str.strip()
-        unique = sorted(y.unique())
-        
-        if len(unique) != 2:
-            raise ValueError(f"[Training] y contains {len(unique)} classes: {unique}. Binary classification is required.")
-        
-        mapping: Dict[str, int] = {unique[0]: 0, unique[1]: 1}
-        y_mapped = y.map(mapping)
-        
-        if y_mapped.isnull().any():
-            raise ValueError("[Training] Mapping error: some labels were not converted.")
-        
-        return y_mapped.astype(int)
+        try:
+            return binary_label_encode(y)
+        except ValueError as e:
+            raise ValueError(f"[Training] {e}") from None
 
     def train(self, X: pd.DataFrame, y: Union[pd.Series, pd.DataFrame]) -> None:
-        self.load_config()
         y_mapped = self.map_labels(y)
-        cv_repeated_stratified_kfold = RepeatedStratifiedKFold(n_splits=5, n_repeats=20, random_state=42)
-
-        self.tpot = TPOTClassifier(
-            config_dict=self.config,
-            cv=cv_repeated_stratified_kfold,
-            scoring="accuracy",
-            generations=3,
-            population_size=20,
-            verbosity=2,
-            random_state=42,
-            n_jobs=-1
+        n_jobs = max(1, (os.cpu_count() or 1) - 1)
+        settings: Dict = self.config.get("settings", {})
+        cv_repeated_stratified_kfold = RepeatedStratifiedKFold(
+            n_splits=settings.get("cv", 3), n_repeats=settings.get("cv_repeats", 20), random_state=42
         )
-            
-        self.tpot.fit(X, y_mapped.values.ravel())
+
+        # Reusing the instance lets warm_start resume from the previous population.
+        if self.tpot is None:
+            self.tpot = SubsampledTPOTClassifier(
+                config_dict=self.config["config_dict"],
+                cv=cv_repeated_stratified_kfold,
+                scoring="accuracy",
+                generations=settings.get("generations", 3),
+                population_size=settings.get("population_size", 20),
+                max_time_mins=settings.get("max_time_mins", 60),
+                early_stop=settings.get("early_stop", 2),
+                verbosity=2,
+                random_state=42,
+                n_jobs=n_jobs,
+                periodic_checkpoint_folder=self.checkpoint_dir,
+                warm_start=True,
+                use_dask=settings.get("use_dask", False),
+                memory=Memory(location=self.cache_dir, verbose=0)
+            )
+            self.tpot.early_subsample = settings.get("early_subsample", 0.3)
+
+        X_arr = X.to_numpy(dtype=np.float32)
+        y_arr = np.ascontiguousarray(y_mapped.to_numpy(dtype=np.int8))
+
+        if settings.get("use_dask", False):
+            # dask.distributed and dask-ml are optional dependencies, only required when enabled in config.json. With use_dask,
+            # TPOT builds one task graph per pipeline and CV fold and computes it on this client's scheduler.
+            from dask.distributed import Client
+
+            with Client(processes=True, n_workers=n_jobs):
+                self.tpot.fit(X_arr, y_arr)
+        else:
+            with parallel_backend("loky", n_jobs=n_jobs):
+                self.tpot.fit(X_arr, y_arr)
+
+        # The transformer cache only pays off within one search; clear it so .tpot_cache does not grow across runs.
+        self.tpot.memory.clear(warn=False)
 
         print("[Training] Best pipeline found:")
         print(self.tpot.fitted_pipeline_)
@@ -93,13 +190,21 @@ class TPOTModelTrainer:
             raise RuntimeError("[Training] No trained pipeline found. Run train() first.")
 
         os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
-        dump(self.tpot.fitted_pipeline_, self.output_path)
+        # TPOT attaches its training-time cache to the pipeline; detach it on a copy so the artifact holds no local path.
+        pipeline = copy.copy(self.tpot.fitted_pipeline_)
+        pipeline.memory = None
+
+        # Left uncompressed so TPOTModelEvaluator can memory-map the saved arrays.
+        dump(pipeline, self.output_path, protocol=5)
         print(f"[Training] Pipeline saved to: {self.output_path}")
 
 
 if __name__ == "__main__":
-    X_train = load_data("X_train.xlsx", "processed")
-    y_train = load_data("y_train.xlsx", "processed")
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        multiprocessing.set_start_method("forkserver", force=True)
+
+    X_train = load_data("X_train.feather", "processed")
+    y_train = load_data("y_train.feather", "processed")
 
     trainer = TPOTModelTrainer()
     trainer.train(X_train, y_train)